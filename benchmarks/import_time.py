@@ -0,0 +1,49 @@
+"""Measure the cost of importing tradetron's public data API.
+
+Each statement is timed in a fresh interpreter, so the numbers reflect what a
+short-lived CLI invocation or cron worker pays at startup.
+
+Usage:
+    python benchmarks/import_time.py [--runs N]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import List
+
+STATEMENTS = [
+    "pass",
+    "from tradetron.data import DataManager",
+    "from tradetron.data import DataManager, DataConfig, DataProcessor",
+    "import tradetron.data.storage.data_manager",
+    # For comparison: what the first call into the data layer has to load
+    "import pandas, pydantic, requests",
+]
+
+def time_import(statement: str, runs: int) -> List[float]:
+    """Return wall-clock seconds for running `statement` in new interpreters"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="runs per statement")
+    args = parser.parse_args()
+
+    print(f"{'statement':<66} {'median':>9} {'min':>9}")
+    for statement in STATEMENTS:
+        timings = time_import(statement, args.runs)
+        print(
+            f"{statement:<66} "
+            f"{statistics.median(timings) * 1000:>7.1f}ms "
+            f"{min(timings) * 1000:>7.1f}ms"
+        )
+
+if __name__ == "__main__":
+    main()
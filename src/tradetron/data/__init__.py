@@ -0,0 +1,40 @@
+"""Data management for tradetron.
+
+Public classes are resolved lazily on first attribute access, so
+``from tradetron.data import DataManager`` does not import pandas, pydantic
+or the HTTP client until they are actually needed.
+"""
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List
+
+if TYPE_CHECKING:
+    from .config import DataConfig
+    from .models.stock_data import OHLCV, AggregateData, StockTicker
+    from .processors.data_processor import DataProcessor
+    from .providers.polygon.client import PolygonClient
+    from .storage.data_manager import DataManager
+
+# Public name -> module (relative to this package) that defines it
+_LAZY_ATTRS: Dict[str, str] = {
+    'DataConfig': '.config',
+    'DataManager': '.storage.data_manager',
+    'DataProcessor': '.processors.data_processor',
+    'PolygonClient': '.providers.polygon.client',
+    'OHLCV': '.models.stock_data',
+    'StockTicker': '.models.stock_data',
+    'AggregateData': '.models.stock_data',
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,37 +1,66 @@
 from typing import Optional
+from datetime import timedelta
 from pathlib import Path
 import os
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-env_path = Path(__file__).parent.parent.parent / '.env'
-load_dotenv(env_path)
+# Location of the project .env file; it is only read when a config is built
+ENV_PATH = Path(__file__).parent.parent.parent / '.env'
+
+_env_loaded = False
+
+def _load_env() -> None:
+    """Load environment variables from .env files (once per process)"""
+    global _env_loaded
+    if _env_loaded:
+        return
+    from dotenv import load_dotenv
+    load_dotenv(ENV_PATH)
+    load_dotenv()
+    _env_loaded = True
 
 class DataConfig:
     """Configuration for data providers"""
-    
-    def __init__(self):
-        load_dotenv()
-        self.POLYGON_API_KEY = os.getenv('POLYGON_API_KEY')
-        if not self.POLYGON_API_KEY:
+
+    def __init__(self, POLYGON_API_KEY: Optional[str] = None):
+        # .env is read here rather than at import time; it also supplies the
+        # cache settings below when the key is passed in explicitly
+        _load_env()
+        api_key = POLYGON_API_KEY if POLYGON_API_KEY is not None else os.getenv('POLYGON_API_KEY')
+        if not api_key:
             raise ValueError("POLYGON_API_KEY environment variable is not set")
-    
+        self.POLYGON_API_KEY: str = api_key
+
+        # Let deployments move the cache out of the installed package
+        cache_dir = os.getenv('DATA_CACHE_DIR')
+        if cache_dir:
+            self.DATA_CACHE_DIR = Path(cache_dir)
+        max_bytes = os.getenv('DATA_CACHE_MAX_BYTES')
+        if max_bytes:
+            self.DATA_CACHE_MAX_BYTES = int(max_bytes)
+        shared_cache = os.getenv('DATA_SHARED_CACHE')
+        if shared_cache:
+            self.DATA_SHARED_CACHE = shared_cache.lower() in ('1', 'true', 'yes')
+
     # Polygon.io settings
     POLYGON_BASE_URL: str = "https://api.polygon.io"
-    
+
     # Rate limiting settings (for free tier)
     POLYGON_RATE_LIMIT_PER_MINUTE: int = 5
-    
+
     # Data storage settings
     DATA_CACHE_DIR: Path = Path(__file__).parent / 'storage' / 'cache'
-    
+    DATA_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    DATA_CACHE_TTL: timedelta = timedelta(days=1)
+    # Serve bars from memory-mapped files shared by all processes on a host
+    # (the returned DataFrames are read-only views)
+    DATA_SHARED_CACHE: bool = False
+
     @classmethod
     def validate(cls) -> bool:
         """Validate the configuration"""
-        if not cls.POLYGON_API_KEY:
-            raise ValueError("POLYGON_API_KEY environment variable is not set")
-        
+        cls()
+
         # Create cache directory if it doesn't exist
         cls.DATA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        
-        return True 
\ No newline at end of file
+
+        return True
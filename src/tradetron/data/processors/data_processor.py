@@ -1,10 +1,11 @@
-import pandas as pd
-import numpy as np
-from typing import List, Optional, Dict
-from ta.trend import SMAIndicator, EMAIndicator, MACD
-from ta.momentum import RSIIndicator, StochasticOscillator
-from ta.volatility import BollingerBands
-from ta.volume import VolumeWeightedAveragePrice
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Optional, Dict
+
+# pandas, numpy and the ta indicator modules are imported where they are
+# used so that importing the processor does not load them
+if TYPE_CHECKING:
+    import pandas as pd
 
 class DataProcessor:
     """Handles data preprocessing and feature engineering"""
@@ -57,30 +58,36 @@ class DataProcessor:
         # Add each indicator
         for indicator, params in indicators.items():
             if indicator == 'sma':
+                from ta.trend import SMAIndicator
                 sma = SMAIndicator(close=df['close'], **params)
                 df['sma'] = sma.sma_indicator()
                 
             elif indicator == 'ema':
+                from ta.trend import EMAIndicator
                 ema = EMAIndicator(close=df['close'], **params)
                 df['ema'] = ema.ema_indicator()
                 
             elif indicator == 'rsi':
+                from ta.momentum import RSIIndicator
                 rsi = RSIIndicator(close=df['close'], **params)
                 df['rsi'] = rsi.rsi()
                 
             elif indicator == 'bbands':
+                from ta.volatility import BollingerBands
                 bb = BollingerBands(close=df['close'], **params)
                 df['bb_high'] = bb.bollinger_hband()
                 df['bb_mid'] = bb.bollinger_mavg()
                 df['bb_low'] = bb.bollinger_lband()
                 
             elif indicator == 'macd':
+                from ta.trend import MACD
                 macd = MACD(close=df['close'], **params)
                 df['macd'] = macd.macd()
                 df['macd_signal'] = macd.macd_signal()
                 df['macd_diff'] = macd.macd_diff()
                 
             elif indicator == 'stoch':
+                from ta.momentum import StochasticOscillator
                 stoch = StochasticOscillator(
                     high=df['high'],
                     low=df['low'],
@@ -91,6 +98,7 @@ class DataProcessor:
                 df['stoch_d'] = stoch.stoch_signal()
                 
             elif indicator == 'vwap':
+                from ta.volume import VolumeWeightedAveragePrice
                 vwap = VolumeWeightedAveragePrice(
                     high=df['high'],
                     low=df['low'],
@@ -103,6 +111,9 @@ class DataProcessor:
     
     def add_price_derived_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add price-derived features"""
+        import numpy as np
+        import pandas as pd
+
         df = df.copy()
         
         # Returns
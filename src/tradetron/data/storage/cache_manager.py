@@ -0,0 +1,464 @@
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, cast
+
+if sys.platform == 'win32':
+    import msvcrt
+
+    def _lock_file(fh: Any) -> None:
+        fh.seek(0)
+        msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _unlock_file(fh: Any) -> None:
+        fh.seek(0)
+        msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock_file(fh: Any) -> None:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(fh: Any) -> None:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+# Per-window entries are named SYMBOL_YYYYMMDD_YYYYMMDD.json
+WINDOW_FILE_RE = re.compile(r'^(?P<symbol>.+)_(?P<start>\d{8})_(?P<end>\d{8})\.json$')
+SEGMENT_SUFFIX = '.segment.json'
+LOCK_FILE = '.lock'
+# Running total of cached bytes, kept up to date under the lock
+SIZE_FILE = '.size'
+# Entry files counted against the size budget, here and in one level of
+# subdirectories (e.g. the shared memory-mapped bar files)
+ENTRY_SUFFIXES = ('.json', '.bars')
+TMP_SUFFIX = '.tmp'
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive inter-process lock on the file at `path`"""
+    with open(path, 'a+b') as fh:
+        _lock_file(fh)
+        try:
+            yield
+        finally:
+            _unlock_file(fh)
+
+def _checksum(doc: Dict[str, Any]) -> str:
+    """SHA-256 over every field of a cache document except the checksum"""
+    body = {k: v for k, v in doc.items() if k != 'checksum'}
+    encoded = json.dumps(body, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+def _bar_date(bar: Dict[str, Any]) -> str:
+    """YYYYMMDD of a cached bar's timestamp"""
+    return datetime.fromisoformat(str(bar['timestamp'])).strftime('%Y%m%d')
+
+def touch_fd(fd: int) -> None:
+    """
+    Record an access for LRU eviction on an open file, keeping its mtime
+
+    Going through the descriptor that was read means a concurrent rename
+    can never move the access (or a stale mtime) onto a newer file.
+    """
+    if os.utime not in os.supports_fd:
+        return
+    try:
+        os.utime(fd, ns=(time.time_ns(), os.fstat(fd).st_mtime_ns))
+    except OSError:
+        pass
+
+def _is_well_formed(doc: Any) -> bool:
+    """Whether a parsed document has the shape of a window or segment entry"""
+    if not isinstance(doc, dict) or not isinstance(doc.get('data'), list):
+        return False
+    if not all(isinstance(bar, dict) and 'timestamp' in bar for bar in doc['data']):
+        return False
+    if not isinstance(doc.get('cached_at', ''), str):
+        return False
+    if 'windows' in doc:
+        return isinstance(doc['windows'], list) and all(
+            isinstance(w, dict)
+            and all(isinstance(w.get(key), str) for key in ('start', 'end', 'cached_at'))
+            for w in doc['windows']
+        )
+    return True
+
+class CacheManager:
+    """
+    Multi-process safe on-disk cache for aggregate bars
+
+    Entries are written atomically (temporary file + rename) while holding an
+    exclusive lock on the cache directory, and carry a SHA-256 checksum that
+    is verified on read; corrupt or malformed entries are treated as misses.
+    A running total of cached bytes is kept next to the lock, so a write only
+    scans the directory when the cache is over its size budget; the scan
+    drops expired entries first, then the least recently used ones.
+    Freshness comes from the cached_at time stored in each entry, so reads
+    (which only record access times) never change it.
+    Per-window files can be compacted into a single segment file per symbol,
+    either on demand or from a background thread (compaction also runs the
+    full eviction scan).
+
+    Reads take no lock; a reader always sees either a complete old file or a
+    complete new one.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl: timedelta = timedelta(days=1)
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+    def window_path(self, symbol: str, start_date: datetime, end_date: datetime) -> Path:
+        """Path of the per-window file for the given parameters"""
+        cache_key = f"{symbol}_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.json"
+        return self.cache_dir / cache_key
+
+    def segment_path(self, symbol: str) -> Path:
+        """Path of the compacted segment file for a symbol"""
+        return self.cache_dir / f"{symbol}{SEGMENT_SUFFIX}"
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Hold the exclusive cache directory lock (blocks other processes)"""
+        with file_lock(self.cache_dir / LOCK_FILE):
+            yield
+
+    def get(
+        self,
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Optional[Tuple[List[Dict[str, Any]], datetime]]:
+        """
+        Look up cached bars for a window
+
+        The per-window file is tried first, then the symbol's segment if one
+        of its unexpired windows covers the requested range.
+
+        Returns:
+            List of bar dictionaries and when they were cached (for a
+            segment, the newest covering window), or None on a miss
+        """
+        expiry = (datetime.now() - self.ttl).isoformat()
+        path = self.window_path(symbol, start_date, end_date)
+        doc = self._read(path, touch=True)
+        if doc is not None and 'windows' not in doc and doc['cached_at'] > expiry:
+            return (
+                cast(List[Dict[str, Any]], doc['data']),
+                datetime.fromisoformat(doc['cached_at'])
+            )
+
+        segment = self.segment_path(symbol)
+        doc = self._read(segment, touch=True)
+        if doc is None:
+            return None
+
+        start, end = start_date.strftime('%Y%m%d'), end_date.strftime('%Y%m%d')
+        covering = [
+            w['cached_at'] for w in doc.get('windows', [])
+            if w['start'] <= start and w['end'] >= end and w['cached_at'] > expiry
+        ]
+        if not covering:
+            return None
+
+        try:
+            bars = [bar for bar in doc['data'] if start <= _bar_date(bar) <= end]
+            return bars, datetime.fromisoformat(max(covering))
+        except ValueError as e:
+            print(f"Error loading cache: {e}")
+            return None
+
+    def put(
+        self,
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime,
+        bars: List[Dict[str, Any]]
+    ) -> Path:
+        """Atomically store bars for a window, then enforce the size budget"""
+        path = self.window_path(symbol, start_date, end_date)
+        doc = {
+            "symbol": symbol,
+            "start": start_date.strftime('%Y%m%d'),
+            "end": end_date.strftime('%Y%m%d'),
+            "data": bars,
+            "cached_at": datetime.now().isoformat()
+        }
+        with self.lock():
+            try:
+                replaced = path.stat().st_size
+            except FileNotFoundError:
+                replaced = 0
+            written = self._write(path, doc)
+            self.record_write(written, replaced)
+        return path
+
+    def record_write(self, written: int, replaced: int) -> None:
+        """
+        Account for a file of `written` bytes that replaced `replaced` bytes,
+        evicting if the cache is now over budget (caller holds lock())
+
+        Other stores that keep files under cache_dir call this so their
+        files count against the same budget.
+        """
+        total = self._read_total()
+        if total is None:
+            self._evict()
+            return
+        total += written - replaced
+        self._write_total(total)
+        if total > self.max_bytes:
+            self._evict()
+
+    def evict(self) -> int:
+        """
+        Remove expired entries, then least recently used ones until the cache
+        fits in max_bytes
+
+        Returns:
+            Number of bytes freed
+        """
+        with self.lock():
+            return self._evict()
+
+    def compact(self, symbol: Optional[str] = None) -> int:
+        """
+        Merge per-window files into one segment file per symbol
+
+        Bars are de-duplicated by timestamp, with newer windows taking
+        precedence. Expired or corrupt window files are dropped.
+
+        Args:
+            symbol: Only compact this symbol (all symbols if None)
+
+        Returns:
+            Number of window files folded into segments
+        """
+        with self.lock():
+            groups: Dict[str, List[Path]] = {}
+            for path in self.cache_dir.iterdir():
+                match = WINDOW_FILE_RE.match(path.name)
+                if match and (symbol is None or match.group('symbol') == symbol):
+                    groups.setdefault(match.group('symbol'), []).append(path)
+
+            compacted = 0
+            for sym, paths in groups.items():
+                compacted += self._compact_symbol(sym, paths)
+            # Also the point where expired entries are cleared and the running
+            # size total is re-synchronised with the directory
+            self._evict()
+            return compacted
+
+    def start_background_compaction(
+        self,
+        interval: float = 300.0
+    ) -> Tuple[threading.Thread, threading.Event]:
+        """
+        Run compact() every `interval` seconds in a daemon thread
+
+        Returns:
+            The thread and an Event; set the event to stop the thread
+        """
+        stop = threading.Event()
+
+        def run() -> None:
+            while not stop.wait(interval):
+                try:
+                    self.compact()
+                except Exception as e:
+                    # Keep the thread alive; the next run retries
+                    print(f"Error compacting cache: {e}")
+
+        thread = threading.Thread(
+            target=run, name='tradetron-cache-compaction', daemon=True
+        )
+        thread.start()
+        return thread, stop
+
+    def _compact_symbol(self, symbol: str, paths: List[Path]) -> int:
+        """Fold window files for one symbol into its segment (lock held)"""
+        segment = self.segment_path(symbol)
+        existing = self._read(segment)
+        windows: Dict[Tuple[str, str], str] = {}
+        bars: Dict[str, Dict[str, Any]] = {}
+        if existing is not None:
+            windows = {(w['start'], w['end']): w['cached_at'] for w in existing['windows']}
+            bars = {str(bar['timestamp']): bar for bar in existing['data']}
+
+        expiry = (datetime.now() - self.ttl).isoformat()
+        sources = []
+        for path in paths:
+            doc = self._read(path)
+            if doc is None or 'windows' in doc or doc['cached_at'] <= expiry:
+                continue
+            match = WINDOW_FILE_RE.match(path.name)
+            assert match is not None
+            sources.append(
+                (doc['cached_at'], match.group('start'), match.group('end'), doc['data'])
+            )
+
+        # Apply oldest first so the freshest copy of each bar wins
+        for cached_at, start, end, data in sorted(sources, key=lambda s: s[0]):
+            if cached_at >= windows.get((start, end), ''):
+                windows[(start, end)] = cached_at
+            for bar in data:
+                bars[str(bar['timestamp'])] = bar
+
+        # Only bars inside a window that is still fresh are kept, so the
+        # segment shrinks as windows expire
+        windows = {key: cached_at for key, cached_at in windows.items() if cached_at > expiry}
+        bars = {
+            key: bar for key, bar in bars.items()
+            if any(start <= _bar_date(bar) <= end for start, end in windows)
+        }
+        if windows:
+            doc = {
+                "symbol": symbol,
+                "windows": [
+                    {"start": start, "end": end, "cached_at": cached_at}
+                    for (start, end), cached_at in sorted(windows.items())
+                ],
+                "data": [bars[key] for key in sorted(bars)]
+            }
+            self._write(segment, doc)
+            # Age the segment by its newest window so TTL eviction by mtime
+            # only removes it once every window has expired
+            newest = datetime.fromisoformat(max(windows.values())).timestamp()
+            os.utime(segment, (datetime.now().timestamp(), newest))
+        else:
+            self._remove(segment)
+
+        # The segment is in place before the window files disappear, so a
+        # concurrent reader never sees a gap
+        for path in paths:
+            self._remove(path)
+        return len(paths)
+
+    def _evict(self) -> int:
+        """Evict by TTL, then LRU (lock held)"""
+        now = datetime.now().timestamp()
+        expiry = now - self.ttl.total_seconds()
+        freed = 0
+        entries = []
+        paths: List[Path] = []
+        for path in self.cache_dir.iterdir():
+            if path.is_dir():
+                paths.extend(path.iterdir())
+            else:
+                paths.append(path)
+        for path in paths:
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            if path.name.endswith(TMP_SUFFIX):
+                # Left behind by a crashed writer; live ones are ours (lock held)
+                freed += st.st_size
+                self._remove(path)
+            elif path.suffix in ENTRY_SUFFIXES:
+                if st.st_mtime < expiry:
+                    freed += st.st_size
+                    self._remove(path)
+                else:
+                    entries.append((st.st_atime, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            freed += size
+        self._write_total(total)
+        return freed
+
+    def _read_total(self) -> Optional[int]:
+        """Running total of cached bytes, or None if unknown (lock held)"""
+        try:
+            return int((self.cache_dir / SIZE_FILE).read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _write_total(self, total: int) -> None:
+        (self.cache_dir / SIZE_FILE).write_text(str(total))
+
+    def _read(self, path: Path, touch: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Read and verify a cache document
+
+        Corrupt or malformed files are treated as a miss and left for the
+        next write or eviction to replace, since another process may be
+        rewriting them. Window documents written before cached_at was
+        stored get it from the mtime of the file that was read.
+
+        Args:
+            touch: Record the read as an access for LRU eviction
+        """
+        try:
+            with open(path, 'rb') as fh:
+                doc = json.loads(fh.read())
+                mtime = os.fstat(fh.fileno()).st_mtime
+                if touch:
+                    touch_fd(fh.fileno())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Error loading cache: {e}")
+            return None
+
+        if not _is_well_formed(doc):
+            print(f"Error loading cache: unexpected layout in {path.name}")
+            return None
+
+        # Files written before checksums were introduced have none to verify
+        if 'checksum' in doc and doc['checksum'] != _checksum(doc):
+            print(f"Error loading cache: checksum mismatch in {path.name}")
+            return None
+        if 'windows' not in doc and 'cached_at' not in doc:
+            doc['cached_at'] = datetime.fromtimestamp(mtime).isoformat()
+        return cast(Dict[str, Any], doc)
+
+    def _write(self, path: Path, doc: Dict[str, Any]) -> int:
+        """
+        Write a document with its checksum via a temporary file and rename
+
+        Returns:
+            Size of the written file in bytes
+        """
+        doc = dict(doc, checksum=_checksum(doc))
+        encoded = json.dumps(doc, default=str).encode()
+        fd, tmp_name = tempfile.mkstemp(
+            dir=self.cache_dir, prefix=f".{path.name}.", suffix=TMP_SUFFIX
+        )
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(encoded)
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp_name, path)
+        except BaseException:
+            self._remove(Path(tmp_name))
+            raise
+        return len(encoded)
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
@@ -1,52 +1,78 @@
+from __future__ import annotations
+
 import os
-from datetime import datetime, timedelta
-import json
-import pandas as pd
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, List
-from ..models.stock_data import OHLCV, StockTicker, AggregateData
-from ..providers.polygon.client import PolygonClient
+from typing import TYPE_CHECKING, Optional, Dict, List, Tuple
 from ..config import DataConfig
+from .cache_manager import CacheManager
+from .mmap_store import MmapBarStore
+
+# pandas, pydantic models and the HTTP client are imported on first use so
+# that importing this module stays cheap for short-lived processes
+if TYPE_CHECKING:
+    import pandas as pd
+    from ..models.stock_data import StockTicker, AggregateData
+    from ..providers.polygon.client import PolygonClient
 
 class DataManager:
     """Manages data storage, caching, and retrieval"""
     
     def __init__(self, config: DataConfig):
         self.config = config
-        self.client = PolygonClient(api_key=config.POLYGON_API_KEY)
-        self.cache_dir = Path(config.DATA_CACHE_DIR)
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._client: Optional[PolygonClient] = None
+        self.cache = CacheManager(
+            config.DATA_CACHE_DIR,
+            max_bytes=config.DATA_CACHE_MAX_BYTES,
+            ttl=config.DATA_CACHE_TTL
+        )
+        self.cache_dir = self.cache.cache_dir
+        self.shared_cache: Optional[MmapBarStore] = None
+        if config.DATA_SHARED_CACHE:
+            self.shared_cache = MmapBarStore(
+                self.cache_dir / 'shared', ttl=config.DATA_CACHE_TTL, cache=self.cache
+            )
+
+    @property
+    def client(self) -> PolygonClient:
+        """Polygon API client, created on first access"""
+        if self._client is None:
+            from ..providers.polygon.client import PolygonClient
+            self._client = PolygonClient(api_key=self.config.POLYGON_API_KEY)
+        return self._client
     
     def _get_cache_path(self, symbol: str, start_date: datetime, end_date: datetime) -> Path:
         """Generate a cache file path for the given parameters"""
-        cache_key = f"{symbol}_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.json"
-        return self.cache_dir / cache_key
+        return self.cache.window_path(symbol, start_date, end_date)
     
-    def _save_to_cache(self, data: AggregateData, cache_path: Path) -> None:
+    def _save_to_cache(self, data: AggregateData, start_date: datetime, end_date: datetime) -> None:
         """Save data to cache"""
-        cache_data = {
-            "symbol": data.symbol,
-            "data": [bar.dict() for bar in data.data],
-            "cached_at": datetime.now().isoformat()
-        }
-        cache_path.write_text(json.dumps(cache_data, default=str))
+        bars = [bar.dict() for bar in data.data]
+        self.cache.put(data.symbol, start_date, end_date, bars)
     
-    def _load_from_cache(self, cache_path: Path) -> Optional[AggregateData]:
-        """Load data from cache if available and not expired"""
-        if not cache_path.exists():
-            return None
-            
-        # Check if cache is expired (1 day for daily data)
-        if cache_path.stat().st_mtime < (datetime.now() - timedelta(days=1)).timestamp():
-            return None
-            
+    def _load_from_cache(
+        self,
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Optional[Tuple[AggregateData, datetime]]:
+        """
+        Load data from cache if available and not expired
+
+        Returns:
+            The cached data and when it was cached, or None on a miss
+        """
+        from ..models.stock_data import OHLCV, AggregateData
         try:
-            cache_data = json.loads(cache_path.read_text())
+            cached = self.cache.get(symbol, start_date, end_date)
+            if cached is None:
+                return None
+            cached_bars, cached_at = cached
             bars = []
-            for bar_data in cache_data["data"]:
+            for bar_data in cached_bars:
                 bar_data["timestamp"] = datetime.fromisoformat(bar_data["timestamp"])
                 bars.append(OHLCV(**bar_data))
-            return AggregateData(symbol=cache_data["symbol"], data=bars)
+            return AggregateData(symbol=symbol, data=bars), cached_at
         except Exception as e:
             print(f"Error loading cache: {e}")
             return None
@@ -68,27 +94,61 @@ class DataManager:
             use_cache: Whether to use cached data if available
             
         Returns:
-            DataFrame with OHLCV data
+            DataFrame with OHLCV data (read-only when served from the
+            shared memory-mapped cache)
         """
-        cache_path = self._get_cache_path(symbol, start_date, end_date)
-        
         # Try to load from cache first
         if use_cache:
-            cached_data = self._load_from_cache(cache_path)
-            if cached_data is not None:
-                return self._convert_to_dataframe(cached_data)
+            if self.shared_cache is not None:
+                df = self.shared_cache.get_frame(symbol, start_date, end_date)
+                if df is not None:
+                    return df
+
+            cached = self._load_from_cache(symbol, start_date, end_date)
+            if cached is not None:
+                cached_data, cached_at = cached
+                df = self._convert_to_dataframe(cached_data)
+                # Keep the original cache time so the shared copy expires
+                # together with the entry it came from
+                self._publish_to_shared_cache(symbol, start_date, end_date, df, cached_at)
+                return df
         
         # Fetch from API if not in cache or cache disabled
         try:
             data = self.client.get_daily_bars(symbol, start_date, end_date)
+            df = self._convert_to_dataframe(data)
             if use_cache:
-                self._save_to_cache(data, cache_path)
-            return self._convert_to_dataframe(data)
+                self._save_to_cache(data, start_date, end_date)
+                self._publish_to_shared_cache(symbol, start_date, end_date, df)
+            return df
         except Exception as e:
             raise Exception(f"Error fetching data for {symbol}: {str(e)}")
     
+    def _publish_to_shared_cache(
+        self,
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime,
+        df: pd.DataFrame,
+        cached_at: Optional[datetime] = None
+    ) -> None:
+        """
+        Write bars to the shared memory-mapped cache, if enabled
+
+        Args:
+            cached_at: When the bars were cached; None for data fresh from
+                the API
+        """
+        if self.shared_cache is None or df.empty:
+            return
+        try:
+            self.shared_cache.put_frame(symbol, start_date, end_date, df, written_at=cached_at)
+        except OSError as e:
+            print(f"Error writing shared cache: {e}")
+    
     def _convert_to_dataframe(self, data: AggregateData) -> pd.DataFrame:
         """Convert AggregateData to pandas DataFrame"""
+        import pandas as pd
         df = pd.DataFrame([{
             'date': bar.timestamp,
             'open': bar.open,
@@ -101,6 +161,8 @@ class DataManager:
         
         if not df.empty:
             df.set_index('date', inplace=True)
+            # Same index unit as frames served from the shared cache
+            df.index = df.index.astype('datetime64[ns]')
             df.sort_index(inplace=True)
         
         return df
@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+from .cache_manager import LOCK_FILE, TMP_SUFFIX, CacheManager, file_lock, touch_fd
+
+# numpy and pandas are imported on first use, like in DataManager
+if TYPE_CHECKING:
+    import pandas as pd
+
+# File layout (little endian):
+#   header      64 bytes  magic, layout version, column count, window count,
+#                         row count
+#   windows     24 bytes per cached window: first and last day (days since
+#               the epoch) and when it was written (ns since the epoch)
+#   directory   32 bytes per column: name, numpy dtype string, data offset
+#   columns     one contiguous array per column, each 64-byte aligned
+# The first column is always 'date' (datetime64[ns] stored as int64),
+# sorted ascending. Every row falls inside at least one window.
+MAGIC = b'TTBARS\x00\x02'
+LAYOUT_VERSION = 2
+HEADER = struct.Struct('<8sIIIQ')
+HEADER_SIZE = 64
+WINDOW_ENTRY = struct.Struct('<qqq')
+COLUMN_ENTRY = struct.Struct('<16s8sQ')
+ALIGNMENT = 64
+NS_PER_DAY = 86_400 * 10**9
+
+COLUMNS: List[Tuple[str, str]] = [
+    ('date', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<i8'),
+    ('vwap', '<f8'),
+]
+
+# (first day, last day, written at) of one cached window
+Window = Tuple[int, int, int]
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def _day(value: datetime) -> int:
+    """Days since the epoch of a datetime's calendar date"""
+    return (value.date() - datetime(1970, 1, 1).date()).days
+
+class _Mapping:
+    """A read-only mapping of one version of a symbol's bar file"""
+
+    def __init__(self, path: Path):
+        import numpy as np
+
+        # Kept open so accesses can be recorded on exactly this file, and so
+        # its inode cannot be reused while the mapping exists
+        self.fh = open(path, 'rb')
+        st = os.fstat(self.fh.fileno())
+        self.mm = mmap.mmap(self.fh.fileno(), 0, access=mmap.ACCESS_READ)
+        # Identifies the file version; a rename by the writer changes the
+        # inode. mtime is left out as the writer sets it after the rename.
+        self.key = (st.st_ino, st.st_size)
+
+        magic, version, n_cols, n_windows, n_rows = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != LAYOUT_VERSION:
+            raise ValueError(f"{path.name} is not a bar file of layout {LAYOUT_VERSION}")
+        self.n_rows = n_rows
+
+        self.windows: List[Window] = [
+            WINDOW_ENTRY.unpack_from(self.mm, HEADER_SIZE + i * WINDOW_ENTRY.size)
+            for i in range(n_windows)
+        ]
+
+        directory = HEADER_SIZE + n_windows * WINDOW_ENTRY.size
+        self.columns: Dict[str, np.ndarray] = {}
+        for i in range(n_cols):
+            name, dtype, offset = COLUMN_ENTRY.unpack_from(
+                self.mm, directory + i * COLUMN_ENTRY.size
+            )
+            self.columns[name.rstrip(b'\x00').decode()] = np.frombuffer(
+                self.mm, dtype=dtype.rstrip(b'\x00').decode(), count=n_rows, offset=offset
+            )
+
+class MmapBarStore:
+    """
+    Shared, memory-mapped store of daily bars for multi-process readers
+
+    Each symbol has one fixed-layout binary file (see the layout above)
+    holding the bars of every window cached for it, together with a table
+    of those windows and when each was written. Readers map it read-only and
+    build DataFrames whose columns are views onto the mapped pages, so every
+    process on a host shares one copy of the data and nothing is parsed on
+    read. The returned frames are read-only: copy them before modifying
+    values in place.
+
+    A writer builds the next version in a temporary file and renames it over
+    the old one while holding the lock. Expired windows, and rows no longer
+    inside a fresh window, are dropped on every write. Readers notice the
+    new inode on their next lookup and remap; frames handed out earlier keep
+    the old mapping alive until they are released.
+
+    When given a CacheManager, the store shares its lock and its files count
+    against the cache's size budget.
+    """
+
+    def __init__(
+        self,
+        store_dir: Path,
+        ttl: timedelta = timedelta(days=1),
+        cache: Optional[CacheManager] = None
+    ):
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.cache = cache
+        self._mappings: Dict[str, _Mapping] = {}
+
+    def path_for(self, symbol: str) -> Path:
+        """Path of the bar file for a symbol"""
+        return self.store_dir / f"{symbol}.bars"
+
+    def get_frame(
+        self,
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Optional[pd.DataFrame]:
+        """
+        Get bars for a window as a zero-copy DataFrame
+
+        Returns:
+            DataFrame indexed by date, or None if no unexpired window in the
+            file covers the requested one
+        """
+        mapping = self._mapping(symbol)
+        if mapping is None:
+            return None
+
+        start, end = _day(start_date), _day(end_date)
+        expiry = self._expiry()
+        if not any(
+            first <= start and last >= end and written_at >= expiry
+            for first, last, written_at in mapping.windows
+        ):
+            return None
+
+        import numpy as np
+        import pandas as pd
+
+        dates = mapping.columns['date']
+        lo, hi = np.searchsorted(dates, [start * NS_PER_DAY, (end + 1) * NS_PER_DAY])
+
+        touch_fd(mapping.fh.fileno())
+        index = pd.DatetimeIndex(dates[lo:hi].view('datetime64[ns]'), copy=False, name='date')
+        frame: pd.DataFrame = pd.DataFrame(
+            {name: mapping.columns[name][lo:hi] for name, _ in COLUMNS[1:]},
+            index=index,
+            copy=False
+        )
+        return frame
+
+    def put_frame(
+        self,
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime,
+        df: pd.DataFrame,
+        written_at: Optional[datetime] = None
+    ) -> Path:
+        """
+        Publish bars for a window
+
+        Rows of other fresh windows are kept, so disjoint ranges of a symbol
+        share one file. Within the new window `df` replaces what was there.
+
+        Args:
+            written_at: When the bars were fetched, which starts the window's
+                TTL (now if None). Pass the original cache time when
+                republishing cached data so it does not get a fresh TTL.
+        """
+        import numpy as np
+        import pandas as pd
+
+        start, end = _day(start_date), _day(end_date)
+        # Missing vwap values (None) become NaN in the float column
+        new = pd.DataFrame(
+            {
+                name: df[name].to_numpy(dtype=dtype, na_value=np.nan)
+                for name, dtype in COLUMNS[1:]
+            },
+            index=df.index.values.astype('datetime64[ns]')
+        )
+        path = self.path_for(symbol)
+
+        with self._lock():
+            windows: List[Window] = []
+            frames = []
+            current = self._mapping(symbol)
+            if current is not None:
+                expiry = self._expiry()
+                # The new window supersedes fresh windows it contains
+                windows = [
+                    w for w in current.windows
+                    if w[2] >= expiry and not (start <= w[0] and w[1] <= end)
+                ]
+                days = current.columns['date'] // NS_PER_DAY
+                keep = np.zeros(len(days), dtype=bool)
+                for first, last, _ in windows:
+                    keep |= (days >= first) & (days <= last)
+                keep &= (days < start) | (days > end)
+                frames.append(pd.DataFrame(
+                    {name: np.array(current.columns[name][keep]) for name, _ in COLUMNS[1:]},
+                    index=current.columns['date'][keep].view('datetime64[ns]')
+                ))
+            frames.append(new)
+            fetched_at = written_at if written_at is not None else datetime.now()
+            windows.append((start, end, int(fetched_at.timestamp() * 1e9)))
+
+            try:
+                replaced = path.stat().st_size
+            except FileNotFoundError:
+                replaced = 0
+            written = self._write(path, pd.concat(frames).sort_index(), sorted(windows))
+            if self.cache is not None:
+                self.cache.record_write(written, replaced)
+        return path
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        if self.cache is not None:
+            with self.cache.lock():
+                yield
+        else:
+            with file_lock(self.store_dir / LOCK_FILE):
+                yield
+
+    def _expiry(self) -> int:
+        return int((datetime.now() - self.ttl).timestamp() * 1e9)
+
+    def _mapping(self, symbol: str) -> Optional[_Mapping]:
+        """Current mapping for a symbol, remapping if the file was replaced"""
+        path = self.path_for(symbol)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            self._mappings.pop(symbol, None)
+            return None
+
+        mapping = self._mappings.get(symbol)
+        if mapping is None or mapping.key != (st.st_ino, st.st_size):
+            try:
+                mapping = _Mapping(path)
+            except (OSError, ValueError, struct.error) as e:
+                print(f"Error mapping bar file: {e}")
+                return None
+            self._mappings[symbol] = mapping
+        return mapping
+
+    def _write(self, path: Path, df: pd.DataFrame, windows: List[Window]) -> int:
+        """
+        Write a new file version via a temporary file and rename (lock held)
+
+        Returns:
+            Size of the written file in bytes
+        """
+        import numpy as np
+
+        arrays: List[Tuple[str, str, Any]] = [
+            ('date', '<i8', df.index.values.astype('datetime64[ns]').view('<i8'))
+        ]
+        arrays += [(name, dtype, df[name].to_numpy(dtype=dtype)) for name, dtype in COLUMNS[1:]]
+
+        header = HEADER.pack(MAGIC, LAYOUT_VERSION, len(arrays), len(windows), len(df))
+        window_table = b''.join(WINDOW_ENTRY.pack(*w) for w in windows)
+
+        directory = b''
+        offset = _align(
+            HEADER_SIZE + len(window_table) + COLUMN_ENTRY.size * len(arrays)
+        )
+        offsets = []
+        for name, dtype, values in arrays:
+            directory += COLUMN_ENTRY.pack(name.encode(), dtype.encode(), offset)
+            offsets.append(offset)
+            offset = _align(offset + values.nbytes)
+
+        fd, tmp_name = tempfile.mkstemp(
+            dir=self.store_dir, prefix=f".{path.name}.", suffix=TMP_SUFFIX
+        )
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(header.ljust(HEADER_SIZE, b'\x00'))
+                fh.write(window_table)
+                fh.write(directory)
+                for (_, _, values), column_offset in zip(arrays, offsets):
+                    fh.seek(column_offset)
+                    fh.write(np.ascontiguousarray(values).tobytes())
+                fh.truncate(offset)
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp_name, path)
+            # Age the file by its newest window so TTL eviction by mtime
+            # removes it once every window has expired
+            os.utime(path, ns=(time.time_ns(), max(w[2] for w in windows)))
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except FileNotFoundError:
+                pass
+            raise
+        return offset
@@ -0,0 +1,171 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from tradetron.data.storage.cache_manager import CacheManager, touch_fd
+
+def _bars(start, days):
+    return [
+        {"timestamp": str(start + timedelta(days=i)), "open": 1.0, "high": 2.0,
+         "low": 0.5, "close": 1.5, "volume": 100 + i, "vwap": None, "transactions": None}
+        for i in range(days)
+    ]
+
+def _put_aged(cache, symbol, start, end, bars, age):
+    """Write a window entry as if it had been cached `age` ago"""
+    cached_at = datetime.now() - age
+    path = cache.window_path(symbol, start, end)
+    cache._write(path, {"symbol": symbol, "data": bars, "cached_at": cached_at.isoformat()})
+    os.utime(path, (cached_at.timestamp(), cached_at.timestamp()))
+    return path
+
+@pytest.fixture
+def cache(tmp_path):
+    return CacheManager(tmp_path)
+
+def test_put_get_roundtrip(cache):
+    """Test bars written atomically can be read back with a valid checksum"""
+    start = datetime(2025, 1, 6, 13)
+    end = start + timedelta(days=4)
+    bars = _bars(start, 5)
+    path = cache.put("AAPL", start, end, bars)
+
+    assert cache.get("AAPL", start, end)[0] == bars
+    assert "checksum" in json.loads(path.read_text())
+    assert not list(cache.cache_dir.glob("*.tmp"))
+
+def test_corrupt_entry_is_a_miss(cache):
+    """Test truncated or tampered files are not served"""
+    start, end = datetime(2025, 1, 6), datetime(2025, 1, 10)
+    path = cache.put("AAPL", start, end, _bars(start, 5))
+
+    doc = json.loads(path.read_text())
+    doc["data"][0]["close"] = 99.0
+    path.write_text(json.dumps(doc))
+    assert cache.get("AAPL", start, end) is None
+
+    path.write_text(json.dumps(doc)[:50])
+    assert cache.get("AAPL", start, end) is None
+
+def test_legacy_entry_without_checksum(cache):
+    """Test cache files written before checksums are still served"""
+    start, end = datetime(2025, 1, 6), datetime(2025, 1, 10)
+    bars = _bars(start, 5)
+    cache.window_path("AAPL", start, end).write_text(
+        json.dumps({"symbol": "AAPL", "data": bars, "cached_at": datetime.now().isoformat()})
+    )
+    assert cache.get("AAPL", start, end)[0] == bars
+
+def test_ttl_eviction(cache):
+    """Test expired entries are removed"""
+    start, end = datetime(2025, 1, 6), datetime(2025, 1, 10)
+    path = _put_aged(cache, "AAPL", start, end, _bars(start, 5), timedelta(days=2))
+
+    assert cache.get("AAPL", start, end) is None
+    assert cache.evict() > 0
+    assert not path.exists()
+
+def test_lru_eviction(tmp_path):
+    """Test least recently used entries are evicted to fit the size budget"""
+    cache = CacheManager(tmp_path, max_bytes=10 ** 9)
+    start = datetime(2025, 1, 6)
+    paths = {}
+    for i, symbol in enumerate(["AAPL", "MSFT", "TSLA"]):
+        paths[symbol] = cache.put(symbol, start, start + timedelta(days=4), _bars(start, 5))
+        # Spread access times out so the ordering does not depend on timer resolution
+        mtime = paths[symbol].stat().st_mtime
+        os.utime(paths[symbol], (mtime - 100 + i, mtime))
+
+    # Reading AAPL makes MSFT the least recently used entry
+    assert cache.get("AAPL", start, start + timedelta(days=4)) is not None
+    cache.max_bytes = sum(p.stat().st_size for p in paths.values()) - 1
+    cache.evict()
+
+    assert not paths["MSFT"].exists()
+    assert paths["AAPL"].exists() and paths["TSLA"].exists()
+
+def test_compaction_into_segment(cache):
+    """Test window files are merged into a per-symbol segment that serves sub-ranges"""
+    start = datetime(2025, 1, 6, 13)
+    cache.put("AAPL", start, start + timedelta(days=4), _bars(start, 5))
+    later = start + timedelta(days=3)
+    cache.put("AAPL", later, later + timedelta(days=4), _bars(later, 5))
+    cache.put("MSFT", start, start + timedelta(days=4), _bars(start, 5))
+
+    assert cache.compact("AAPL") == 2
+    names = sorted(p.name for p in cache.cache_dir.glob("*.json"))
+    assert names == ["AAPL.segment.json", "MSFT_20250106_20250110.json"]
+
+    # Each original window is still served, and overlapping bars come from
+    # the newer window
+    first, _ = cache.get("AAPL", start, start + timedelta(days=4))
+    assert [bar["timestamp"] for bar in first] == [bar["timestamp"] for bar in _bars(start, 5)]
+    assert first[3:] == _bars(later, 2)
+    segment = json.loads(cache.segment_path("AAPL").read_text())
+    assert len(segment["data"]) == 8
+
+    # A range no single window covered is a miss
+    assert cache.get("AAPL", start, later + timedelta(days=4)) is None
+
+def test_compaction_prunes_bars_of_expired_windows(cache):
+    """Test bars only covered by expired windows are dropped from the segment"""
+    start = datetime(2025, 1, 1, 13)
+    _put_aged(cache, "AAPL", start, start + timedelta(days=29), _bars(start, 30), timedelta(days=2))
+    cache.compact("AAPL")
+    later = start + timedelta(days=40)
+    cache.put("AAPL", later, later + timedelta(days=4), _bars(later, 5))
+    cache.compact("AAPL")
+
+    segment = json.loads(cache.segment_path("AAPL").read_text())
+    assert len(segment["data"]) == 5
+
+def test_malformed_entry_is_a_miss(cache):
+    """Test well-formed JSON with the wrong layout is a miss, not an error"""
+    start, end = datetime(2025, 1, 6), datetime(2025, 1, 10)
+    cache.window_path("AAPL", start, end).write_text(json.dumps({"data": [1, 2]}))
+    cache.segment_path("AAPL").write_text(json.dumps({"data": [], "windows": [{}]}))
+
+    assert cache.get("AAPL", start, end) is None
+    assert cache.compact() == 1
+
+def test_put_tracks_size_without_scanning(cache, monkeypatch):
+    """Test writes under budget update the running total instead of scanning"""
+    start = datetime(2025, 1, 6)
+    cache.put("AAPL", start, start + timedelta(days=4), _bars(start, 5))
+
+    def fail():
+        raise AssertionError("unexpected eviction scan")
+
+    monkeypatch.setattr(cache, "_evict", fail)
+    path = cache.put("MSFT", start, start + timedelta(days=4), _bars(start, 5))
+    cache.put("MSFT", start, start + timedelta(days=4), _bars(start, 5))
+    assert cache._read_total() == sum(p.stat().st_size for p in cache.cache_dir.glob("*.json"))
+    assert path.exists()
+
+def test_reads_do_not_change_freshness(cache):
+    """Test freshness comes from cached_at and reads keep the file's mtime"""
+    start, end = datetime(2025, 1, 6), datetime(2025, 1, 10)
+    path = _put_aged(cache, "AAPL", start, end, _bars(start, 5), timedelta(hours=1))
+    mtime_ns = path.stat().st_mtime_ns
+
+    # A recent mtime does not make an old entry fresh
+    os.utime(path)
+    cache.ttl = timedelta(minutes=30)
+    assert cache.get("AAPL", start, end) is None
+
+    cache.ttl = timedelta(days=1)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    assert cache.get("AAPL", start, end) is not None
+    assert path.stat().st_mtime_ns == mtime_ns
+
+def test_touch_after_replace_leaves_new_file_alone(cache):
+    """Test touching a file that was renamed over does not age its replacement"""
+    start, end = datetime(2025, 1, 6), datetime(2025, 1, 10)
+    path = _put_aged(cache, "AAPL", start, end, _bars(start, 5), timedelta(days=2))
+    with open(path, "rb") as fh:
+        cache.put("AAPL", start, end, _bars(start, 5))
+        fresh_mtime_ns = path.stat().st_mtime_ns
+        touch_fd(fh.fileno())
+
+    assert path.stat().st_mtime_ns == fresh_mtime_ns
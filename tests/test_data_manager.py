@@ -20,4 +20,22 @@ def test_cache_path_generation(sample_api_key, sample_dates):
     assert cache_path.suffix == ".json"
     assert "AAPL" in cache_path.name
     assert start_date.strftime("%Y%m%d") in cache_path.name
-    assert end_date.strftime("%Y%m%d") in cache_path.name 
\ No newline at end of file
+    assert end_date.strftime("%Y%m%d") in cache_path.name
+
+
+def test_cache_settings_from_dotenv(tmp_path, sample_api_key, monkeypatch):
+    """Test cache settings in .env apply even when the API key is passed in"""
+    import tradetron.data.config as config_module
+
+    env_file = tmp_path / ".env"
+    env_file.write_text(f"DATA_CACHE_DIR={tmp_path / 'cache'}\nDATA_CACHE_MAX_BYTES=1024\n")
+    # setenv first so monkeypatch restores the original values afterwards
+    for name in ("DATA_CACHE_DIR", "DATA_CACHE_MAX_BYTES"):
+        monkeypatch.setenv(name, "")
+        monkeypatch.delenv(name)
+    monkeypatch.setattr(config_module, "ENV_PATH", env_file)
+    monkeypatch.setattr(config_module, "_env_loaded", False)
+
+    config = DataConfig(POLYGON_API_KEY=sample_api_key)
+    assert config.DATA_CACHE_DIR == tmp_path / "cache"
+    assert config.DATA_CACHE_MAX_BYTES == 1024
@@ -0,0 +1,48 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+# Modules that must not be loaded just by importing the public API
+HEAVY_MODULES = ["pandas", "numpy", "pydantic", "requests", "ratelimit", "ta", "dotenv"]
+
+def _loaded_after(statement):
+    """Run an import in a fresh interpreter and return heavy modules it loaded"""
+    code = (
+        "import sys, json\n"
+        f"{statement}\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+@pytest.mark.parametrize("statement", [
+    "from tradetron.data import DataManager, DataConfig, DataProcessor",
+    "import tradetron.data.storage.data_manager",
+    "import tradetron.data.processors.data_processor",
+    "import tradetron.data.config",
+])
+def test_import_is_lazy(statement):
+    """Test importing the data package does not pull in heavy dependencies"""
+    assert _loaded_after(statement) == []
+
+def test_lazy_attribute_resolution():
+    """Test lazily exported names resolve to the defining classes"""
+    import tradetron.data as data
+    from tradetron.data.storage.data_manager import DataManager
+
+    assert data.DataManager is DataManager
+    assert "DataManager" in dir(data)
+    with pytest.raises(AttributeError):
+        data.DoesNotExist
+
+def test_client_created_on_first_use(sample_api_key):
+    """Test DataManager defers building the Polygon client"""
+    from tradetron.data import DataConfig, DataManager
+
+    manager = DataManager(DataConfig(POLYGON_API_KEY=sample_api_key))
+    assert manager._client is None
+    assert manager.client is manager.client
@@ -0,0 +1,170 @@
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+from tradetron.data.config import DataConfig
+from tradetron.data.storage.cache_manager import CacheManager
+from tradetron.data.storage.data_manager import DataManager
+from tradetron.data.storage.mmap_store import MmapBarStore
+
+def _frame(start, days, close=1.5):
+    index = pd.DatetimeIndex([start + timedelta(days=i) for i in range(days)], name='date')
+    return pd.DataFrame({
+        'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': close,
+        'volume': np.arange(days, dtype='int64') + 100, 'vwap': None
+    }, index=index)
+
+@pytest.fixture
+def store(tmp_path):
+    return MmapBarStore(tmp_path)
+
+def test_roundtrip_is_zero_copy(store):
+    """Test bars are served as read-only views onto the mapped file"""
+    start = datetime(2025, 1, 6, 13)
+    store.put_frame("AAPL", start, start + timedelta(days=9), _frame(start, 10))
+
+    df = store.get_frame("AAPL", start + timedelta(days=2), start + timedelta(days=4))
+    assert list(df.index) == [start + timedelta(days=i) for i in range(2, 5)]
+    assert list(df['volume']) == [102, 103, 104]
+    assert df['vwap'].isna().all()
+
+    mapping = store._mappings["AAPL"]
+    assert np.shares_memory(df['close'].to_numpy(), mapping.columns['close'])
+    with pytest.raises(ValueError):
+        df.loc[df.index[0], 'close'] = 3.0
+
+def test_misses(store):
+    """Test missing, uncovered and expired windows are not served"""
+    start = datetime(2025, 1, 6)
+    assert store.get_frame("AAPL", start, start) is None
+
+    store.put_frame("AAPL", start, start + timedelta(days=4), _frame(start, 5))
+    assert store.get_frame("AAPL", start, start + timedelta(days=5)) is None
+
+    store.ttl = timedelta(0)
+    assert store.get_frame("AAPL", start, start + timedelta(days=4)) is None
+
+def test_readers_pick_up_new_version(tmp_path):
+    """Test another reader remaps after the writer publishes a new file"""
+    writer, reader = MmapBarStore(tmp_path), MmapBarStore(tmp_path)
+    start = datetime(2025, 1, 6)
+    writer.put_frame("AAPL", start, start + timedelta(days=4), _frame(start, 5))
+    before = reader.get_frame("AAPL", start, start + timedelta(days=4))
+
+    # Overlapping window shares the file, newer rows win
+    later = start + timedelta(days=3)
+    writer.put_frame("AAPL", later, later + timedelta(days=4), _frame(later, 5, close=9.0))
+    after = reader.get_frame("AAPL", start, start + timedelta(days=4))
+
+    assert list(before['close']) == [1.5] * 5
+    assert list(after['close']) == [1.5] * 3 + [9.0] * 2
+    assert not list(tmp_path.glob("*.tmp"))
+
+def test_disjoint_windows_share_a_file(store):
+    """Test a window that does not overlap the file is added, not swapped in"""
+    start = datetime(2025, 1, 6)
+    later = start + timedelta(days=20)
+    store.put_frame("AAPL", start, start + timedelta(days=4), _frame(start, 5))
+    store.put_frame("AAPL", later, later + timedelta(days=4), _frame(later, 5))
+
+    assert len(store.get_frame("AAPL", start, start + timedelta(days=4))) == 5
+    assert len(store.get_frame("AAPL", later, later + timedelta(days=4))) == 5
+    assert store.get_frame("AAPL", start, later) is None
+
+def test_expired_windows_are_dropped_on_write(store):
+    """Test rows only covered by expired windows are not kept or served"""
+    start = datetime(2025, 1, 1)
+    store.put_frame("AAPL", start, start + timedelta(days=29), _frame(start, 30))
+    time.sleep(0.2)
+    store.ttl = timedelta(seconds=0.1)
+    later = start + timedelta(days=1)
+    store.put_frame("AAPL", later, later + timedelta(days=4), _frame(later, 5))
+
+    assert store._mapping("AAPL").n_rows == 5
+    assert store.get_frame("AAPL", start, start + timedelta(days=29)) is None
+    assert len(store.get_frame("AAPL", later, later + timedelta(days=4))) == 5
+
+def test_new_window_replaces_rows_in_its_range(store):
+    """Test rows the new fetch lacks do not leak in from an older window"""
+    start = datetime(2025, 1, 6)
+    store.put_frame("AAPL", start, start + timedelta(days=9), _frame(start, 10))
+    middle = start + timedelta(days=3)
+    store.put_frame("AAPL", middle, middle + timedelta(days=2), _frame(middle, 1))
+
+    df = store.get_frame("AAPL", middle, middle + timedelta(days=2))
+    assert list(df.index) == [middle]
+
+def test_shared_files_count_against_cache_budget(tmp_path):
+    """Test bar files are evicted under the cache's size budget"""
+    cache = CacheManager(tmp_path)
+    store = MmapBarStore(tmp_path / "shared", cache=cache)
+    start = datetime(2025, 1, 6)
+    path = store.put_frame("AAPL", start, start + timedelta(days=4), _frame(start, 5))
+    assert cache._read_total() == path.stat().st_size
+
+    cache.max_bytes = 0
+    cache.evict()
+    assert not path.exists()
+    assert store.get_frame("AAPL", start, start + timedelta(days=4)) is None
+
+def test_corrupt_file_is_a_miss(store):
+    """Test a file that is not a valid bar file is ignored"""
+    store.path_for("AAPL").write_bytes(b"garbage")
+    assert store.get_frame("AAPL", datetime(2025, 1, 6), datetime(2025, 1, 6)) is None
+
+def test_data_manager_shared_read_path(tmp_path, sample_api_key, monkeypatch):
+    """Test DataManager publishes cached bars and serves them from the shared cache"""
+    monkeypatch.setenv("DATA_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("DATA_SHARED_CACHE", "1")
+    manager = DataManager(DataConfig(POLYGON_API_KEY=sample_api_key))
+    start, end = datetime(2025, 1, 6, 13), datetime(2025, 1, 10, 13)
+    bars = [
+        {"timestamp": str(start + timedelta(days=i)), "open": 1.0, "high": 2.0,
+         "low": 0.5, "close": 1.5, "volume": 100, "vwap": 1.2, "transactions": None}
+        for i in range(5)
+    ]
+    manager.cache.put("AAPL", start, end, bars)
+
+    first = manager.get_daily_data("AAPL", start, end)
+    assert manager.shared_cache.path_for("AAPL").exists()
+    second = manager.get_daily_data("AAPL", start, end)
+    pd.testing.assert_frame_equal(first, second)
+    assert not second['close'].to_numpy().flags.writeable
+
+def test_republished_entry_keeps_its_cache_time(tmp_path, sample_api_key, monkeypatch):
+    """Test bars republished from an almost-expired JSON entry expire with it"""
+    monkeypatch.setenv("DATA_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("DATA_SHARED_CACHE", "1")
+    manager = DataManager(DataConfig(POLYGON_API_KEY=sample_api_key))
+    start, end = datetime(2025, 1, 6, 13), datetime(2025, 1, 10, 13)
+    cached_at = datetime.now() - manager.cache.ttl + timedelta(seconds=1)
+    bars = [
+        {"timestamp": str(start + timedelta(days=i)), "open": 1.0, "high": 2.0,
+         "low": 0.5, "close": 1.5, "volume": 100, "vwap": 1.2, "transactions": None}
+        for i in range(5)
+    ]
+    manager.cache._write(
+        manager.cache.window_path("AAPL", start, end),
+        {"symbol": "AAPL", "data": bars, "cached_at": cached_at.isoformat()}
+    )
+
+    assert manager.get_daily_data("AAPL", start, end) is not None
+    mapping = manager.shared_cache._mapping("AAPL")
+    assert mapping.windows[0][2] == int(cached_at.timestamp() * 1e9)
+    path = manager.shared_cache.path_for("AAPL")
+    assert path.stat().st_mtime_ns == mapping.windows[0][2]
+
+    time.sleep(1.1)
+    assert manager._load_from_cache("AAPL", start, end) is None
+    assert manager.shared_cache.get_frame("AAPL", start, end) is None
+
+def test_reads_keep_the_mapping(store):
+    """Test recording an access does not make the file look like a new version"""
+    start = datetime(2025, 1, 6)
+    store.put_frame("AAPL", start, start + timedelta(days=4), _frame(start, 5))
+    store.get_frame("AAPL", start, start + timedelta(days=4))
+    mapping = store._mappings["AAPL"]
+    store.get_frame("AAPL", start, start + timedelta(days=4))
+    assert store._mappings["AAPL"] is mapping